@@ -1,11 +1,15 @@
 """
 Cliente para la API de vacantes docentes del portal ABC.
 """
+import functools
 import logging
+import operator
 import ssl
+import time
 import requests
+from collections import defaultdict
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.ssl_ import create_urllib3_context
@@ -25,24 +29,74 @@ def normalizar_texto(texto: str) -> str:
         return texto
 
 
+# Contexto SSL para servidores con TLS antiguo (se construye una sola vez)
+_LEGACY_CTX = create_urllib3_context()
+_LEGACY_CTX.check_hostname = False
+_LEGACY_CTX.verify_mode = ssl.CERT_NONE
+# Permitir protocolos más antiguos
+_LEGACY_CTX.options &= ~ssl.OP_NO_SSLv3
+_LEGACY_CTX.set_ciphers("DEFAULT:@SECLEVEL=1")
+
+
 # Adapter para manejar servidores con SSL/TLS antiguo
 class TLSAdapter(HTTPAdapter):
     """Adapter que permite conexiones con servidores TLS legacy."""
 
     def init_poolmanager(self, *args, **kwargs):
-        ctx = create_urllib3_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-        # Permitir protocolos más antiguos
-        ctx.options &= ~ssl.OP_NO_SSLv3
-        ctx.set_ciphers("DEFAULT:@SECLEVEL=1")
-        kwargs["ssl_context"] = ctx
+        kwargs["ssl_context"] = _LEGACY_CTX
         return super().init_poolmanager(*args, **kwargs)
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _build_fq(distrito: str, niveles: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Construye los filtros Solr (fq) en un orden estable.
+
+    Solr cachea cada fq por su texto exacto (filterCache), así que generar
+    siempre el mismo string para la misma búsqueda aprovecha esa cache.
+
+    Args:
+        distrito: Nombre del distrito
+        niveles: Niveles educativos ya ordenados
+
+    Returns:
+        Tupla de filtros fq
+    """
+    fq_params = [
+        "estado:Publicada",
+        f"descdistrito:{distrito.lower()}",
+    ]
+
+    # Agregar filtro de niveles (OR entre ellos)
+    if niveles:
+        niveles_filter = " OR ".join(f'descnivelmodalidad:"{n.lower()}"' for n in niveles)
+        fq_params.append(f"({niveles_filter})")
+
+    return tuple(fq_params)
+
+
+# Días de la semana y el atributo de Vacante con su horario
+_DIAS = (
+    ("lunes", "h_lunes"),
+    ("martes", "h_martes"),
+    ("miercoles", "h_miercoles"),
+    ("jueves", "h_jueves"),
+    ("viernes", "h_viernes"),
+    ("sabado", "h_sabado"),
+)
+
+
+# Campos de texto de la respuesta (faltantes equivalen a "")
+_FIELD_KEYS = (
+    "id", "cargo", "descripcioncargo", "areaincumbencia", "descnivelmodalidad",
+    "descdistrito", "escuela", "domiciliodesempeno", "turno", "jornada",
+    "lunes", "martes", "miercoles", "jueves", "viernes", "sabado",
+)
+_GET = operator.itemgetter(*_FIELD_KEYS)
+
+
+@dataclass(slots=True, frozen=True)
 class Vacante:
     """Representa una vacante docente."""
     id: str
@@ -59,42 +113,106 @@ class Vacante:
     jornada: str
     fecha_inicio: Optional[str]
     fecha_fin_oferta: Optional[str]
-    horarios: dict
+    h_lunes: str
+    h_martes: str
+    h_miercoles: str
+    h_jueves: str
+    h_viernes: str
+    h_sabado: str
     docente_reemplazado: Optional[str]
     motivo_reemplazo: Optional[str]
+    # Horarios ya formateados (ej: "lunes: 08:00-12:00 | martes: ..."), calculado al crear
+    horarios_str: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        horarios = " | ".join(
+            f"{dia}: {getattr(self, attr)}" for dia, attr in _DIAS if getattr(self, attr)
+        )
+        # Dataclass frozen: asignar sin pasar por __setattr__
+        object.__setattr__(self, "horarios_str", horarios)
 
     @classmethod
     def from_api_response(cls, data: dict) -> "Vacante":
         """Crea una Vacante desde la respuesta de la API."""
-        codigo_escuela = data.get("escuela", "")
+        try:
+            campos = _GET(data)
+        except KeyError:
+            # Algún campo falta en el documento: completar con ""
+            campos = _GET(defaultdict(str, data))
+        (id_, cargo, descripcion_cargo, area, nivel, distrito, codigo_escuela,
+         domicilio, turno, jornada, lunes, martes, miercoles, jueves, viernes,
+         sabado) = campos
+
         return cls(
-            id=data.get("id", ""),
+            id=id_,
             id_oferta=str(data.get("idoferta", "")),
-            cargo=normalizar_texto(data.get("cargo", "")),
-            descripcion_cargo=data.get("descripcioncargo", ""),
-            area_incumbencia=data.get("areaincumbencia", "").upper().strip(),
-            nivel_modalidad=data.get("descnivelmodalidad", ""),
-            distrito=data.get("descdistrito", ""),
+            cargo=normalizar_texto(cargo),
+            descripcion_cargo=descripcion_cargo,
+            area_incumbencia=area.upper().strip(),
+            nivel_modalidad=nivel,
+            distrito=distrito,
             escuela_codigo=codigo_escuela,
             escuela_nombre=obtener_nombre_escuela(codigo_escuela),
-            domicilio=data.get("domiciliodesempeno", ""),
-            turno=data.get("turno", ""),
-            jornada=data.get("jornada", ""),
+            domicilio=domicilio,
+            turno=turno,
+            jornada=jornada,
             fecha_inicio=data.get("tomaposesion"),
             fecha_fin_oferta=data.get("finoferta"),
-            horarios={
-                "lunes": data.get("lunes", ""),
-                "martes": data.get("martes", ""),
-                "miercoles": data.get("miercoles", ""),
-                "jueves": data.get("jueves", ""),
-                "viernes": data.get("viernes", ""),
-                "sabado": data.get("sabado", ""),
-            },
+            h_lunes=lunes,
+            h_martes=martes,
+            h_miercoles=miercoles,
+            h_jueves=jueves,
+            h_viernes=viernes,
+            h_sabado=sabado,
             docente_reemplazado=data.get("reemp_apeynom"),
             motivo_reemplazo=data.get("reemp_motivo"),
         )
 
 
+# Campos de Solr que usa Vacante.from_api_response (parámetro fl)
+_FL = ",".join(_FIELD_KEYS + (
+    "idoferta", "tomaposesion", "finoferta", "reemp_apeynom", "reemp_motivo",
+))
+
+# Tamaño de página para consultas con cursorMark
+_PAGE_SIZE = 500
+
+# Conexiones por host que mantiene el pool HTTP
+_POOL_MAXSIZE = 16
+
+# Cache de resultados: tiempo de vida en segundos y cantidad de consultas
+_CACHE_TTL = 120
+_CACHE_MAXSIZE = 16
+
+
+@functools.lru_cache(maxsize=8)
+def _build_params(
+    distrito: str,
+    niveles: tuple[str, ...],
+    max_resultados: int
+) -> tuple[tuple[str, object], ...]:
+    """
+    Construye los parámetros de la consulta Solr, una sola vez por combinación.
+
+    Args:
+        distrito: Nombre del distrito
+        niveles: Niveles educativos ya ordenados
+        max_resultados: Máximo de resultados a retornar
+
+    Returns:
+        Tupla de pares (parámetro, valor); cada filtro fq va como par separado
+    """
+    params = [
+        ("q", "*:*"),
+        ("wt", "json"),
+        ("rows", max_resultados),
+        ("sort", "finoferta asc"),  # Ordenar por fecha de cierre
+        ("fl", _FL),  # Solo los campos que usa Vacante
+    ]
+    params.extend(("fq", fq) for fq in _build_fq(distrito, niveles))
+    return tuple(params)
+
+
 class APIClient:
     """Cliente para consultar la API de vacantes ABC."""
 
@@ -105,8 +223,57 @@ class APIClient:
             "Accept": "application/json",
             "User-Agent": "VacantesMonitor/1.0"
         })
-        # Montar adapter TLS para el servidor del gobierno
-        self.session.mount("https://", TLSAdapter())
+        # Montar adapter TLS para el servidor del gobierno (pool explícito)
+        self.session.mount("https://", TLSAdapter(
+            pool_connections=4,
+            pool_maxsize=_POOL_MAXSIZE,
+            pool_block=False,
+        ))
+        # Resultados recientes: clave de consulta -> (timestamp, vacantes)
+        self._cache: dict[tuple, tuple[float, list[Vacante]]] = {}
+
+    def invalidate_cache(self):
+        """Descarta los resultados cacheados para forzar una consulta real."""
+        self._cache.clear()
+
+    def _consultar(self, params: list[tuple[str, object]]) -> dict:
+        """Ejecuta una consulta a la API y retorna el JSON de la respuesta."""
+        response = self.session.get(self.base_url, params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def _consultar_paginado(
+        self,
+        params: list[tuple[str, object]],
+        max_resultados: int
+    ) -> list[dict]:
+        """
+        Recorre los resultados con cursorMark de Solr, de a _PAGE_SIZE por página.
+
+        Args:
+            params: Parámetros base de la consulta
+            max_resultados: Máximo de documentos a retornar
+
+        Returns:
+            Lista de documentos de la respuesta
+        """
+        params = [(k, v) for k, v in params if k not in ("rows", "sort")]
+        params.append(("rows", _PAGE_SIZE))
+        # cursorMark requiere un orden que incluya la clave única
+        params.append(("sort", "finoferta asc,id asc"))
+
+        docs = []
+        cursor = "*"
+        while len(docs) < max_resultados:
+            data = self._consultar(params + [("cursorMark", cursor)])
+            docs.extend(data.get("response", {}).get("docs", []))
+
+            siguiente = data.get("nextCursorMark")
+            if not siguiente or siguiente == cursor:
+                break
+            cursor = siguiente
+
+        return docs[:max_resultados]
 
     def buscar_vacantes(
         self,
@@ -127,52 +294,41 @@ class APIClient:
         """
         distrito = distrito or config.DISTRITO
         niveles = niveles or config.NIVELES
+        niveles_ordenados = tuple(sorted(niveles))
 
-        # Construir filtros Solr
-        fq_params = [
-            "estado:Publicada",
-            f"descdistrito:{distrito.lower()}",
-        ]
-
-        # Agregar filtro de niveles (OR entre ellos)
-        if niveles:
-            niveles_filter = " OR ".join([f'descnivelmodalidad:"{n.lower()}"' for n in niveles])
-            fq_params.append(f"({niveles_filter})")
-
-        params = {
-            "q": "*:*",
-            "wt": "json",
-            "rows": max_resultados,
-            "sort": "finoferta asc",  # Ordenar por fecha de cierre
-        }
-
-        # Agregar cada filtro como parámetro fq separado
-        for fq in fq_params:
-            if "fq" not in params:
-                params["fq"] = []
-            if isinstance(params["fq"], list):
-                params["fq"].append(fq)
-            else:
-                params["fq"] = [params["fq"], fq]
+        # Reusar resultados de una consulta idéntica reciente
+        clave = (distrito, niveles_ordenados, max_resultados)
+        cacheado = self._cache.get(clave)
+        if cacheado and time.monotonic() - cacheado[0] < _CACHE_TTL:
+            logger.info("Usando %s vacantes en cache para distrito=%s", len(cacheado[1]), distrito)
+            return list(cacheado[1])
 
-        try:
-            logger.info(f"Consultando API: distrito={distrito}, niveles={niveles}")
-            response = self.session.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
+        params = list(_build_params(distrito, niveles_ordenados, max_resultados))
 
-            data = response.json()
-            docs = data.get("response", {}).get("docs", [])
+        try:
+            logger.info("Consultando API: distrito=%s, niveles=%s", distrito, niveles)
+            if max_resultados > _PAGE_SIZE:
+                docs = self._consultar_paginado(params, max_resultados)
+            else:
+                data = self._consultar(params)
+                docs = data.get("response", {}).get("docs", [])
 
             vacantes = [Vacante.from_api_response(doc) for doc in docs]
-            logger.info(f"Se encontraron {len(vacantes)} vacantes")
+            logger.info("Se encontraron %s vacantes", len(vacantes))
+
+            # Guardar en cache, descartando la consulta más antigua si está llena
+            self._cache.pop(clave, None)
+            if len(self._cache) >= _CACHE_MAXSIZE:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[clave] = (time.monotonic(), vacantes)
 
-            return vacantes
+            return list(vacantes)
 
         except requests.RequestException as e:
-            logger.error(f"Error al consultar API: {e}")
+            logger.error("Error al consultar API: %s", e)
             raise
         except (KeyError, ValueError) as e:
-            logger.error(f"Error al parsear respuesta: {e}")
+            logger.error("Error al parsear respuesta: %s", e)
             raise
 
 
@@ -192,17 +348,16 @@ def filtrar_por_codigos(vacantes: list[Vacante], codigos_habilitados: set[str])
         return vacantes
 
     # Normalizar códigos (mayúsculas, sin espacios)
-    codigos_norm = {c.upper().strip() for c in codigos_habilitados}
+    codigos_norm = frozenset(c.upper().strip() for c in codigos_habilitados)
+
+    # area_incumbencia ya viene normalizada desde Vacante.from_api_response
+    filtradas = [v for v in vacantes if v.area_incumbencia in codigos_norm]
 
-    filtradas = []
-    for v in vacantes:
-        area = v.area_incumbencia.upper().strip()
-        # Comparar área de la vacante con códigos habilitados
-        if area in codigos_norm:
-            filtradas.append(v)
-            logger.debug(f"Vacante {v.id} coincide con código {area}")
+    if logger.isEnabledFor(logging.DEBUG):
+        for v in filtradas:
+            logger.debug("Vacante %s coincide con código %s", v.id, v.area_incumbencia)
 
-    logger.info(f"Filtradas {len(filtradas)} vacantes de {len(vacantes)} por códigos de oblea")
+    logger.info("Filtradas %s vacantes de %s por códigos de oblea", len(filtradas), len(vacantes))
     return filtradas
 
 
@@ -23,12 +23,12 @@ def cargar_escuelas() -> dict:
     try:
         with open(archivo, "r", encoding="utf-8") as f:
             _escuelas_cache = json.load(f)
-            logger.debug(f"Cargadas {len(_escuelas_cache)} escuelas")
+            logger.debug("Cargadas %s escuelas", len(_escuelas_cache))
     except FileNotFoundError:
-        logger.warning(f"Archivo de escuelas no encontrado: {archivo}")
+        logger.warning("Archivo de escuelas no encontrado: %s", archivo)
         _escuelas_cache = {}
     except json.JSONDecodeError as e:
-        logger.error(f"Error al parsear archivo de escuelas: {e}")
+        logger.error("Error al parsear archivo de escuelas: %s", e)
         _escuelas_cache = {}
 
     return _escuelas_cache
@@ -7,6 +7,7 @@ que coincidan con los códigos de habilitación de la oblea.
 import logging
 import sys
 from datetime import datetime
+from functools import partial
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -14,15 +15,16 @@ from apscheduler.triggers.interval import IntervalTrigger
 import config
 from api_client import APIClient, filtrar_por_codigos
 from oblea_parser import obtener_codigos_habilitados
+import storage
 from storage import (
     inicializar_db,
     filtrar_nuevas,
-    marcar_como_notificada,
+    marcar_muchas,
     registrar_consulta,
     obtener_estadisticas,
     limpiar_antiguas,
 )
-from notifier import enviar_email
+from notifier import SmtpNotifier, enviar_email
 
 # Configurar logging
 logging.basicConfig(
@@ -35,25 +37,33 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def verificar_vacantes():
+def verificar_vacantes(client: APIClient, smtp: SmtpNotifier):
     """
     Tarea principal: busca vacantes, filtra y notifica.
+
+    Args:
+        client: Cliente de la API reutilizado entre ejecuciones (mantiene
+            el pool de conexiones y el handshake TLS con el servidor)
+        smtp: Notificador SMTP; la conexión se cierra al terminar cada
+            verificación para no dejarla inactiva horas entre ejecuciones
     """
     logger.info("=" * 50)
     logger.info("Iniciando verificación de vacantes...")
-    logger.info(f"Distrito: {config.DISTRITO}")
-    logger.info(f"Niveles: {config.NIVELES}")
+    logger.info("Distrito: %s", config.DISTRITO)
+    logger.info("Niveles: %s", config.NIVELES)
+
+    # Releer el archivo de datos por si cambió entre ejecuciones
+    storage.reload()
 
     try:
         # 1. Obtener códigos de la oblea
         codigos = obtener_codigos_habilitados()
         if codigos:
-            logger.info(f"Códigos de oblea: {codigos}")
+            logger.info("Códigos de oblea: %s", codigos)
         else:
             logger.warning("No se encontraron códigos de oblea, se mostrarán todas las vacantes")
 
         # 2. Consultar API
-        client = APIClient()
         vacantes = client.buscar_vacantes()
 
         if not vacantes:
@@ -81,30 +91,44 @@ def verificar_vacantes():
             return
 
         # 5. Notificar por email
-        logger.info(f"Encontradas {len(nuevas)} vacantes nuevas!")
-        if enviar_email(nuevas):
+        logger.info("Encontradas %s vacantes nuevas!", len(nuevas))
+        if enviar_email(nuevas, smtp):
             # Marcar como notificadas solo si el email se envió
-            for v in nuevas:
-                marcar_como_notificada(v.id, v.cargo, v.area_incumbencia, v.nivel_modalidad, v.escuela_nombre)
+            marcar_muchas(nuevas)
+            # La próxima ejecución debe consultar la API, no la cache
+            client.invalidate_cache()
             registrar_consulta(len(vacantes), len(nuevas), "OK")
         else:
             registrar_consulta(len(vacantes), len(nuevas), "ERROR - Email no enviado")
 
     except Exception as e:
-        logger.error(f"Error en verificación: {e}", exc_info=True)
+        logger.error("Error en verificación: %s", e, exc_info=True)
         registrar_consulta(0, 0, f"ERROR - {str(e)[:100]}")
+    finally:
+        smtp.close()
+
+
+def limpiar_registros():
+    """Limpia registros antiguos, releyendo antes el archivo por si otro proceso lo modificó."""
+    storage.reload()
+    limpiar_antiguas(30)
 
 
 def ejecutar_una_vez():
     """Ejecuta una verificación única (sin scheduler)."""
     inicializar_db()
-    verificar_vacantes()
+    client = APIClient()
+    smtp = SmtpNotifier()
+    try:
+        verificar_vacantes(client, smtp)
+    finally:
+        smtp.close()
 
 
 def iniciar_scheduler():
     """Inicia el scheduler para ejecución periódica."""
     logger.info("Iniciando Monitor de Vacantes Docentes ABC")
-    logger.info(f"Intervalo de verificación: cada {config.CHECK_INTERVAL_HOURS} horas")
+    logger.info("Intervalo de verificación: cada %s horas", config.CHECK_INTERVAL_HOURS)
 
     # Inicializar base de datos
     inicializar_db()
@@ -114,15 +138,19 @@ def iniciar_scheduler():
 
     # Mostrar estadísticas
     stats = obtener_estadisticas()
-    logger.info(f"Estadísticas: {stats}")
+    logger.info("Estadísticas: %s", stats)
+
+    # Cliente y conexión SMTP compartidos entre ejecuciones para reutilizar conexiones
+    client = APIClient()
+    smtp = SmtpNotifier()
 
     # Ejecutar una vez al inicio
-    verificar_vacantes()
+    verificar_vacantes(client, smtp)
 
     # Configurar scheduler
     scheduler = BlockingScheduler()
     scheduler.add_job(
-        verificar_vacantes,
+        partial(verificar_vacantes, client, smtp),
         trigger=IntervalTrigger(hours=config.CHECK_INTERVAL_HOURS),
         id="verificar_vacantes",
         name="Verificar vacantes docentes",
@@ -131,7 +159,7 @@ def iniciar_scheduler():
 
     # Limpiar registros antiguos una vez al día
     scheduler.add_job(
-        lambda: limpiar_antiguas(30),
+        limpiar_registros,
         trigger=IntervalTrigger(days=1),
         id="limpiar_antiguos",
         name="Limpiar registros antiguos",
@@ -144,6 +172,7 @@ def iniciar_scheduler():
     except (KeyboardInterrupt, SystemExit):
         logger.info("Deteniendo scheduler...")
         scheduler.shutdown()
+        smtp.close()
 
 
 def mostrar_ayuda():
@@ -1,6 +1,7 @@
 """
 Notificador por email para vacantes docentes.
 """
+import functools
 import logging
 import smtplib
 from email.mime.text import MIMEText
@@ -8,7 +9,7 @@ from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 
 import config
-from api_client import Vacante
+from api_client import Vacante, _DIAS
 
 logger = logging.getLogger(__name__)
 
@@ -18,54 +19,51 @@ def generar_link_postulantes(vacante: Vacante) -> str:
     return f"https://misservicios.abc.gob.ar/actos.publicos.digitales/postulantes/?oferta={vacante.id_oferta}&detalle={vacante.id}"
 
 
-def generar_html_vacante(vacante: Vacante) -> str:
-    """Genera el HTML para mostrar una vacante."""
-    horarios = []
-    for dia, horas in vacante.horarios.items():
-        if horas:
-            horarios.append(f"<li><strong>{dia.capitalize()}:</strong> {horas}</li>")
+# Segundos de espera máximos en operaciones SMTP (evita bloquear el scheduler)
+_SMTP_TIMEOUT = 30
 
-    horarios_html = "<ul>" + "".join(horarios) + "</ul>" if horarios else "No especificado"
-    link_postulantes = generar_link_postulantes(vacante)
+# Atributo de horario de cada día con su etiqueta ya capitalizada
+_DIAS_HTML = [(attr, dia.capitalize()) for dia, attr in _DIAS]
 
-    return f"""
+# Plantilla HTML de una vacante (se completa con format_map)
+VACANTE_TEMPLATE = """
     <div style="border: 1px solid #ddd; border-radius: 8px; padding: 15px; margin: 10px 0; background: #f9f9f9;">
-        <h3 style="color: #2c5282; margin-top: 0;">{vacante.cargo}</h3>
+        <h3 style="color: #2c5282; margin-top: 0;">{cargo}</h3>
         <table style="width: 100%; border-collapse: collapse;">
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold; width: 150px;">Nivel:</td>
-                <td style="padding: 5px 0;">{vacante.nivel_modalidad.upper()}</td>
+                <td style="padding: 5px 0;">{nivel}</td>
             </tr>
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold;">Área/Código:</td>
-                <td style="padding: 5px 0;">{vacante.area_incumbencia}</td>
+                <td style="padding: 5px 0;">{area_incumbencia}</td>
             </tr>
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold;">Escuela:</td>
-                <td style="padding: 5px 0;">{vacante.escuela_nombre}</td>
+                <td style="padding: 5px 0;">{escuela_nombre}</td>
             </tr>
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold;">Domicilio:</td>
-                <td style="padding: 5px 0;">{vacante.domicilio}</td>
+                <td style="padding: 5px 0;">{domicilio}</td>
             </tr>
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold;">Turno:</td>
-                <td style="padding: 5px 0;">{vacante.turno} - {vacante.jornada}</td>
+                <td style="padding: 5px 0;">{turno} - {jornada}</td>
             </tr>
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold;">Toma posesión:</td>
-                <td style="padding: 5px 0;">{vacante.fecha_inicio or 'No especificado'}</td>
+                <td style="padding: 5px 0;">{fecha_inicio}</td>
             </tr>
             <tr>
                 <td style="padding: 5px 10px 5px 0; font-weight: bold;">Cierre oferta:</td>
-                <td style="padding: 5px 0; color: #c53030;">{vacante.fecha_fin_oferta or 'No especificado'}</td>
+                <td style="padding: 5px 0; color: #c53030;">{fecha_fin_oferta}</td>
             </tr>
         </table>
         <div style="margin-top: 10px;">
             <strong>Horarios:</strong>
             {horarios_html}
         </div>
-        {f'<p style="color: #666; font-size: 0.9em;">Reemplazo de: {vacante.docente_reemplazado} ({vacante.motivo_reemplazo})</p>' if vacante.docente_reemplazado else ''}
+        {reemplazo_html}
         <div style="margin-top: 15px;">
             <a href="{link_postulantes}" style="background: #2c5282; color: white; padding: 8px 16px; text-decoration: none; border-radius: 4px; font-size: 0.9em;">Ver mi ranking en esta vacante</a>
         </div>
@@ -73,9 +71,47 @@ def generar_html_vacante(vacante: Vacante) -> str:
     """
 
 
+@functools.lru_cache(maxsize=1024)
+def generar_html_vacante(vacante: Vacante) -> str:
+    """
+    Genera el HTML para mostrar una vacante.
+
+    Vacante es inmutable (y hashable), así que el resultado se cachea y se
+    reutiliza si el mismo email se vuelve a generar (por ejemplo, al reintentar).
+    """
+    items = "".join(
+        f"<li><strong>{dia}:</strong> {getattr(vacante, attr)}</li>"
+        for attr, dia in _DIAS_HTML if getattr(vacante, attr)
+    )
+    horarios_html = f"<ul>{items}</ul>" if items else "No especificado"
+
+    if vacante.docente_reemplazado:
+        reemplazo_html = (
+            f'<p style="color: #666; font-size: 0.9em;">Reemplazo de: '
+            f'{vacante.docente_reemplazado} ({vacante.motivo_reemplazo})</p>'
+        )
+    else:
+        reemplazo_html = ""
+
+    return VACANTE_TEMPLATE.format_map({
+        "cargo": vacante.cargo,
+        "nivel": vacante.nivel_modalidad.upper(),
+        "area_incumbencia": vacante.area_incumbencia,
+        "escuela_nombre": vacante.escuela_nombre,
+        "domicilio": vacante.domicilio,
+        "turno": vacante.turno,
+        "jornada": vacante.jornada,
+        "fecha_inicio": vacante.fecha_inicio or "No especificado",
+        "fecha_fin_oferta": vacante.fecha_fin_oferta or "No especificado",
+        "horarios_html": horarios_html,
+        "reemplazo_html": reemplazo_html,
+        "link_postulantes": generar_link_postulantes(vacante),
+    })
+
+
 def generar_email_html(vacantes: list[Vacante]) -> str:
     """Genera el contenido HTML del email con todas las vacantes."""
-    vacantes_html = "\n".join(generar_html_vacante(v) for v in vacantes)
+    vacantes_html = "\n".join([generar_html_vacante(v) for v in vacantes])
 
     return f"""
     <!DOCTYPE html>
@@ -107,12 +143,66 @@ def generar_email_html(vacantes: list[Vacante]) -> str:
     """
 
 
-def enviar_email(vacantes: list[Vacante]) -> bool:
+class SmtpNotifier:
+    """Mantiene una conexión SMTP abierta para reutilizarla entre envíos."""
+
+    def __init__(self):
+        self._smtp: smtplib.SMTP | None = None
+
+    def _conectar(self) -> smtplib.SMTP:
+        """Abre la conexión, inicia TLS y se autentica."""
+        logger.info("Conectando a %s:%s", config.SMTP_SERVER, config.SMTP_PORT)
+        smtp = smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT, timeout=_SMTP_TIMEOUT)
+        try:
+            smtp.starttls()
+            smtp.login(config.EMAIL_FROM, config.EMAIL_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _ensure(self) -> smtplib.SMTP:
+        """Retorna una conexión activa, reconectando si el servidor la cerró."""
+        if self._smtp is not None:
+            try:
+                # NOOP verifica que la conexión siga viva
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        self._smtp = self._conectar()
+        return self._smtp
+
+    def send(self, msg: MIMEMultipart):
+        """Envía un mensaje, reintentando una vez si se perdió la conexión."""
+        try:
+            self._ensure().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            logger.warning("Conexión SMTP perdida, reconectando...")
+            self.close()
+            self._ensure().send_message(msg)
+
+    def close(self):
+        """Cierra la conexión si está abierta."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+
+def enviar_email(vacantes: list[Vacante], smtp: SmtpNotifier = None, to: str = None) -> bool:
     """
     Envía un email con las vacantes encontradas.
 
     Args:
         vacantes: Lista de vacantes a notificar
+        smtp: Conexión SMTP a reutilizar (si no se pasa, se abre una sólo para este envío)
+        to: Email destinatario (usa config.EMAIL_TO si no se especifica)
 
     Returns:
         True si el envío fue exitoso, False en caso contrario
@@ -121,7 +211,9 @@ def enviar_email(vacantes: list[Vacante]) -> bool:
         logger.info("No hay vacantes para notificar")
         return True
 
-    if not config.EMAIL_FROM or not config.EMAIL_PASSWORD or not config.EMAIL_TO:
+    to = to or config.EMAIL_TO
+
+    if not config.EMAIL_FROM or not config.EMAIL_PASSWORD or not to:
         logger.error("Credenciales de email no configuradas")
         return False
 
@@ -130,20 +222,23 @@ def enviar_email(vacantes: list[Vacante]) -> bool:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = f"[ABC] {len(vacantes)} nuevas vacantes en Patagones"
         msg["From"] = config.EMAIL_FROM
-        msg["To"] = config.EMAIL_TO
+        msg["To"] = to
 
         # Contenido HTML
         html_content = generar_email_html(vacantes)
         msg.attach(MIMEText(html_content, "html"))
 
         # Enviar
-        logger.info(f"Conectando a {config.SMTP_SERVER}:{config.SMTP_PORT}")
-        with smtplib.SMTP(config.SMTP_SERVER, config.SMTP_PORT) as server:
-            server.starttls()
-            server.login(config.EMAIL_FROM, config.EMAIL_PASSWORD)
-            server.send_message(msg)
+        if smtp is not None:
+            smtp.send(msg)
+        else:
+            notificador = SmtpNotifier()
+            try:
+                notificador.send(msg)
+            finally:
+                notificador.close()
 
-        logger.info(f"Email enviado exitosamente a {config.EMAIL_TO}")
+        logger.info("Email enviado exitosamente a %s", to)
         return True
 
     except smtplib.SMTPAuthenticationError:
@@ -151,10 +246,10 @@ def enviar_email(vacantes: list[Vacante]) -> bool:
         logger.error("Para Gmail, necesitas crear una 'App Password' en tu cuenta")
         return False
     except smtplib.SMTPException as e:
-        logger.error(f"Error SMTP: {e}")
+        logger.error("Error SMTP: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Error al enviar email: {e}")
+        logger.error("Error al enviar email: %s", e)
         return False
 
 
@@ -177,14 +272,12 @@ def enviar_test():
         jornada="JS",
         fecha_inicio="2026-03-01",
         fecha_fin_oferta="2026-02-28",
-        horarios={
-            "lunes": "08:00-12:00",
-            "martes": "08:00-12:00",
-            "miercoles": "08:00-12:00",
-            "jueves": "08:00-12:00",
-            "viernes": "08:00-12:00",
-            "sabado": "",
-        },
+        h_lunes="08:00-12:00",
+        h_martes="08:00-12:00",
+        h_miercoles="08:00-12:00",
+        h_jueves="08:00-12:00",
+        h_viernes="08:00-12:00",
+        h_sabado="",
         docente_reemplazado="García, María",
         motivo_reemplazo="Licencia médica",
     )
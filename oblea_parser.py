@@ -13,10 +13,20 @@ logger = logging.getLogger(__name__)
 
 # Patrones comunes de códigos de área/incumbencia en obleas
 # Ejemplos: AE, /AL, FPG, MAT, LEN, EFI, MUS, etc.
+# El patrón ya valida el formato (2-4 letras, o "/" + 2-3 letras),
+# así que cada coincidencia es un código válido sin filtrado adicional.
+# No tiene cuantificadores anidados: re lo evalúa en tiempo lineal, sin
+# backtracking catastrófico, incluso sobre obleas de muchas páginas.
 CODIGO_PATTERN = re.compile(
-    r'\b([A-Z]{2,4}|/[A-Z]{2,3})\b'
+    r'\b(?:/[A-Z]{2,3}|[A-Z]{2,4})\b'
 )
 
+# Líneas de comentario (# al inicio, ignorando espacios) en listas de códigos
+_COMENTARIO_RE = re.compile(r'^[^\S\n]*#.*$', re.MULTILINE)
+
+# Separadores entre códigos: comas y cualquier espacio en blanco
+_SEPARADOR_RE = re.compile(r'[,\s]+')
+
 # Códigos conocidos de áreas docentes (se puede expandir)
 CODIGOS_CONOCIDOS = {
     # Áreas generales
@@ -34,30 +44,41 @@ CODIGOS_CONOCIDOS = {
 }
 
 
-def extraer_texto_pdf(pdf_path: str) -> str:
+def _iter_page_text(pdf_path: str):
     """
-    Extrae todo el texto de un archivo PDF.
+    Recorre un PDF página por página, sin retener el texto de las anteriores.
 
     Args:
         pdf_path: Ruta al archivo PDF
 
-    Returns:
-        Texto extraído del PDF
+    Yields:
+        Texto de cada página que tenga contenido
     """
     path = Path(pdf_path)
     if not path.exists():
         raise FileNotFoundError(f"No se encontró el archivo: {pdf_path}")
 
-    texto_completo = []
-
     with pdfplumber.open(path) as pdf:
         for i, page in enumerate(pdf.pages):
             texto = page.extract_text()
+            # Liberar los objetos parseados de la página
+            page.flush_cache()
             if texto:
-                texto_completo.append(texto)
-                logger.debug(f"Página {i+1}: {len(texto)} caracteres extraídos")
+                logger.debug("Página %s: %s caracteres extraídos", i+1, len(texto))
+                yield texto
+
+
+def extraer_texto_pdf(pdf_path: str) -> str:
+    """
+    Extrae todo el texto de un archivo PDF.
+
+    Args:
+        pdf_path: Ruta al archivo PDF
 
-    return "\n".join(texto_completo)
+    Returns:
+        Texto extraído del PDF
+    """
+    return "\n".join(_iter_page_text(pdf_path))
 
 
 def extraer_codigos_oblea(pdf_path: str = None) -> set[str]:
@@ -73,36 +94,26 @@ def extraer_codigos_oblea(pdf_path: str = None) -> set[str]:
     pdf_path = pdf_path or config.OBLEA_PDF_PATH
 
     try:
-        texto = extraer_texto_pdf(pdf_path)
-        logger.info(f"Texto extraído del PDF: {len(texto)} caracteres")
-
-        # Buscar todos los patrones que parecen códigos
-        matches = CODIGO_PATTERN.findall(texto.upper())
-
-        # Filtrar solo los que parecen códigos válidos
+        # Buscar los patrones que parecen códigos, página por página
         codigos = set()
-        for match in matches:
-            codigo = match.strip()
-            # Incluir si es un código conocido o tiene formato típico
-            if codigo in CODIGOS_CONOCIDOS or (
-                len(codigo) >= 2 and
-                len(codigo) <= 4 and
-                codigo.replace("/", "").isalpha()
-            ):
-                codigos.add(codigo)
-
-        logger.info(f"Se encontraron {len(codigos)} códigos: {codigos}")
+        caracteres = 0
+        for texto in _iter_page_text(pdf_path):
+            caracteres += len(texto)
+            codigos.update(CODIGO_PATTERN.findall(texto.upper()))
+        logger.info("Texto extraído del PDF: %s caracteres", caracteres)
+
+        logger.info("Se encontraron %s códigos: %s", len(codigos), codigos)
         return codigos
 
     except FileNotFoundError:
-        logger.warning(f"No se encontró el PDF de oblea en {pdf_path}")
+        logger.warning("No se encontró el PDF de oblea en %s", pdf_path)
         return set()
     except Exception as e:
-        logger.error(f"Error al procesar oblea: {e}")
+        logger.error("Error al procesar oblea: %s", e)
         return set()
 
 
-def extraer_codigos_desde_texto(texto: str) -> set[str]:
+def extraer_codigos_desde_texto(texto: str) -> frozenset[str]:
     """
     Extrae códigos de un texto plano (alternativa al PDF).
     Útil si el usuario quiere ingresar los códigos manualmente.
@@ -111,30 +122,18 @@ def extraer_codigos_desde_texto(texto: str) -> set[str]:
         texto: Texto con códigos separados por comas, espacios o líneas
 
     Returns:
-        Set de códigos normalizados
+        Set inmutable de códigos normalizados
     """
-    codigos = set()
-
-    for linea in texto.split("\n"):
-        # Ignorar comentarios y líneas vacías
-        linea = linea.strip()
-        if not linea or linea.startswith("#"):
-            continue
-
-        # Separar por comas o espacios si hay múltiples en una línea
-        partes = re.split(r'[,\s]+', linea.upper())
+    # Quitar comentarios y separar todo el texto de una sola pasada
+    sin_comentarios = _COMENTARIO_RE.sub("", texto)
+    partes = _SEPARADOR_RE.split(sin_comentarios.upper())
 
-        for parte in partes:
-            codigo = parte.strip()
-            # Aceptar códigos de 2-4 caracteres, incluyendo prefijos especiales
-            # Ejemplos: /PR, +3N, -7H, CCD, APV
-            if codigo and len(codigo) >= 2 and len(codigo) <= 4:
-                codigos.add(codigo)
+    # Aceptar códigos de 2-4 caracteres, incluyendo prefijos especiales
+    # Ejemplos: /PR, +3N, -7H, CCD, APV
+    return frozenset(p for p in partes if 2 <= len(p) <= 4)
 
-    return codigos
 
-
-def cargar_codigos_desde_archivo(archivo: str = "codigos.txt") -> set[str]:
+def cargar_codigos_desde_archivo(archivo: str = "codigos.txt") -> frozenset[str]:
     """
     Carga códigos desde un archivo de texto simple.
     Alternativa al PDF si el usuario prefiere listar manualmente.
@@ -147,14 +146,14 @@ def cargar_codigos_desde_archivo(archivo: str = "codigos.txt") -> set[str]:
     """
     path = Path(archivo)
     if not path.exists():
-        logger.debug(f"No existe archivo de códigos: {archivo}")
-        return set()
+        logger.debug("No existe archivo de códigos: %s", archivo)
+        return frozenset()
 
     texto = path.read_text(encoding="utf-8")
     return extraer_codigos_desde_texto(texto)
 
 
-def obtener_codigos_habilitados() -> set[str]:
+def obtener_codigos_habilitados() -> frozenset[str]:
     """
     Obtiene los códigos habilitados de cualquier fuente disponible.
     Prioridad: archivo codigos.txt > PDF oblea
@@ -165,16 +164,16 @@ def obtener_codigos_habilitados() -> set[str]:
     # Primero intentar desde archivo de texto (más simple)
     codigos = cargar_codigos_desde_archivo()
     if codigos:
-        logger.info(f"Códigos cargados desde archivo: {codigos}")
+        logger.info("Códigos cargados desde archivo: %s", codigos)
         return codigos
 
     # Si no hay archivo, intentar extraer del PDF
     codigos = extraer_codigos_oblea()
     if codigos:
-        return codigos
+        return frozenset(codigos)
 
     logger.warning("No se pudieron obtener códigos de oblea")
-    return set()
+    return frozenset()
 
 
 if __name__ == "__main__":
@@ -3,9 +3,15 @@ Almacenamiento de vacantes notificadas usando JSON (compatible con GitHub Action
 """
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa json de la stdlib
+    orjson = None
+
 import config
 
 logger = logging.getLogger(__name__)
@@ -13,29 +19,72 @@ logger = logging.getLogger(__name__)
 # Archivo JSON para persistir datos
 DATA_FILE = Path(__file__).parent / "data" / "vacantes_notificadas.json"
 
+# Cache en memoria del contenido de DATA_FILE, válida mientras no cambie su mtime
+_CACHE: dict | None = None
+_CACHE_MTIME_NS: int = 0
+
+# Nota: "vacantes_notificadas" se mantiene en orden cronológico de inserción
+# (la más reciente al final), así que no hace falta ordenarlo para mostrarlo.
+
 
 def inicializar_db():
     """Crea el archivo JSON si no existe."""
     DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     if not DATA_FILE.exists():
-        DATA_FILE.write_text(json.dumps({
+        _guardar_datos({
             "vacantes_notificadas": {},
             "log_consultas": []
-        }, indent=2))
+        })
         logger.info("Archivo de datos inicializado")
 
 
+def _serializar(datos: dict) -> bytes:
+    """Serializa los datos a JSON indentado (el archivo se versiona en el repo)."""
+    if orjson is not None:
+        return orjson.dumps(datos, option=orjson.OPT_INDENT_2)
+    return json.dumps(datos, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _mtime_ns() -> int:
+    """Fecha de modificación de DATA_FILE (0 si no existe)."""
+    try:
+        return DATA_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
 def _cargar_datos() -> dict:
-    """Carga los datos del archivo JSON."""
-    if not DATA_FILE.exists():
-        return {"vacantes_notificadas": {}, "log_consultas": []}
-    return json.loads(DATA_FILE.read_text())
+    """Carga los datos del archivo JSON, releyéndolo si otro proceso lo modificó."""
+    global _CACHE, _CACHE_MTIME_NS
+
+    mtime_ns = _mtime_ns()
+    if _CACHE is None or mtime_ns != _CACHE_MTIME_NS:
+        if mtime_ns:
+            contenido = DATA_FILE.read_bytes()
+            _CACHE = orjson.loads(contenido) if orjson is not None else json.loads(contenido)
+        else:
+            _CACHE = {"vacantes_notificadas": {}, "log_consultas": []}
+        _CACHE_MTIME_NS = mtime_ns
+    return _CACHE
 
 
 def _guardar_datos(datos: dict):
-    """Guarda los datos en el archivo JSON."""
-    DATA_FILE.write_text(json.dumps(datos, indent=2, ensure_ascii=False))
+    """Guarda los datos en el archivo JSON y actualiza la cache."""
+    global _CACHE, _CACHE_MTIME_NS
+
+    # Escribir a un temporal y reemplazar, para no dejar el archivo a medio escribir
+    tmp = DATA_FILE.with_suffix(".json.tmp")
+    tmp.write_bytes(_serializar(datos))
+    os.replace(tmp, DATA_FILE)
+    _CACHE = datos
+    _CACHE_MTIME_NS = _mtime_ns()
+
+
+def reload():
+    """Descarta la cache para que la próxima lectura vuelva a leer el archivo."""
+    global _CACHE
+    _CACHE = None
 
 
 def vacante_ya_notificada(vacante_id: str) -> bool:
@@ -47,6 +96,8 @@ def vacante_ya_notificada(vacante_id: str) -> bool:
 def marcar_como_notificada(vacante_id: str, cargo: str, area: str, nivel: str, escuela: str = ""):
     """Marca una vacante como notificada."""
     datos = _cargar_datos()
+    # Quitar antes de insertar para que quede al final (orden cronológico)
+    datos["vacantes_notificadas"].pop(vacante_id, None)
     datos["vacantes_notificadas"][vacante_id] = {
         "cargo": cargo,
         "area": area,
@@ -55,17 +106,40 @@ def marcar_como_notificada(vacante_id: str, cargo: str, area: str, nivel: str, e
         "fecha_notificacion": datetime.now().isoformat()
     }
     _guardar_datos(datos)
-    logger.debug(f"Vacante {vacante_id} marcada como notificada")
+    logger.debug("Vacante %s marcada como notificada", vacante_id)
+
+
+def marcar_muchas(vacantes: list):
+    """Marca varias vacantes como notificadas con una sola escritura."""
+    if not vacantes:
+        return
+
+    datos = _cargar_datos()
+    fecha = datetime.now().isoformat()
+    notificadas = datos["vacantes_notificadas"]
+    # Quitar antes de insertar para que queden al final (orden cronológico)
+    for v in vacantes:
+        notificadas.pop(v.id, None)
+    notificadas.update({
+        v.id: {
+            "cargo": v.cargo,
+            "area": v.area_incumbencia,
+            "nivel": v.nivel_modalidad,
+            "escuela": v.escuela_nombre,
+            "fecha_notificacion": fecha
+        }
+        for v in vacantes
+    })
+    _guardar_datos(datos)
+    logger.debug("%s vacantes marcadas como notificadas", len(vacantes))
 
 
 def filtrar_nuevas(vacantes: list) -> list:
     """Filtra vacantes, retornando solo las no notificadas."""
-    nuevas = []
-    for v in vacantes:
-        if not vacante_ya_notificada(v.id):
-            nuevas.append(v)
+    notificadas = _cargar_datos()["vacantes_notificadas"]
+    nuevas = [v for v in vacantes if v.id not in notificadas]
 
-    logger.info(f"De {len(vacantes)} vacantes, {len(nuevas)} son nuevas")
+    logger.info("De %s vacantes, %s son nuevas", len(vacantes), len(nuevas))
     return nuevas
 
 
@@ -98,23 +172,20 @@ def limpiar_antiguas(dias: int = 30):
     from datetime import timedelta
 
     datos = _cargar_datos()
-    ahora = datetime.now()
-    limite = ahora - timedelta(days=dias)
-
-    vacantes_actuales = {}
-    eliminadas = 0
+    # Las fechas se guardan en ISO 8601, que ordena igual como string
+    limite_iso = (datetime.now() - timedelta(days=dias)).isoformat()
 
-    for vid, info in datos["vacantes_notificadas"].items():
-        fecha = datetime.fromisoformat(info["fecha_notificacion"])
-        if fecha > limite:
-            vacantes_actuales[vid] = info
-        else:
-            eliminadas += 1
+    notificadas = datos["vacantes_notificadas"]
+    vacantes_actuales = {
+        vid: info for vid, info in notificadas.items()
+        if info["fecha_notificacion"] > limite_iso
+    }
+    eliminadas = len(notificadas) - len(vacantes_actuales)
 
     if eliminadas:
         datos["vacantes_notificadas"] = vacantes_actuales
         _guardar_datos(datos)
-        logger.info(f"Eliminadas {eliminadas} vacantes antiguas (>{dias} días)")
+        logger.info("Eliminadas %s vacantes antiguas (>%s días)", eliminadas, dias)
 
 
 if __name__ == "__main__":
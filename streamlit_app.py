@@ -2,10 +2,18 @@
 Monitor de Vacantes Docentes ABC - Interfaz Web
 """
 import streamlit as st
+import pandas as pd
 import json
+import os
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional; sin él se usa json de la stdlib
+    orjson = None
+
 # Configurar página
 st.set_page_config(
     page_title="Vacantes Docentes ABC",
@@ -16,20 +24,93 @@ st.set_page_config(
 # Importar módulos del proyecto
 from api_client import APIClient, filtrar_por_codigos, Vacante
 from oblea_parser import obtener_codigos_habilitados, extraer_codigos_desde_texto
-from storage import inicializar_db, filtrar_nuevas, marcar_como_notificada, obtener_estadisticas, _cargar_datos
+from storage import inicializar_db, marcar_muchas
 from notifier import enviar_email
-import config
 
 # Archivos de configuración
 CONFIG_FILE = Path(__file__).parent / "data" / "config_ui.json"
 CODIGOS_FILE = Path(__file__).parent / "codigos.txt"
 DATA_FILE = Path(__file__).parent / "data" / "vacantes_notificadas.json"
 
+# Columnas de la tabla de vacantes actuales (campo de Vacante -> encabezado)
+COLUMNAS_VACANTES = {
+    "cargo": "Cargo",
+    "nivel_modalidad": "Nivel",
+    "area_incumbencia": "Área",
+    "escuela_nombre": "Escuela",
+    "turno": "Turno",
+    "fecha_fin_oferta": "Cierre oferta",
+}
+
+# Vacantes notificadas (las más recientes) que se muestran en el historial
+NOTIFICADAS_MOSTRADAS = 50
+
+
+def _mtime_ns(path: Path) -> int:
+    """Fecha de modificación del archivo, usada como clave de cache (0 si no existe)."""
+    return path.stat().st_mtime_ns if path.exists() else 0
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _leer_json(path_str: str, mtime_ns: int) -> dict:
+    """Lee y parsea un JSON; se reutiliza mientras el archivo no cambie (CONFIG_FILE y DATA_FILE)."""
+    contenido = Path(path_str).read_bytes()
+    return orjson.loads(contenido) if orjson is not None else json.loads(contenido)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def _leer_texto(path_str: str, mtime_ns: int) -> str:
+    """Lee un archivo de texto; se reutiliza mientras el archivo no cambie."""
+    return Path(path_str).read_text()
+
+
+def _datos_notificadas(mtime_ns: int) -> dict:
+    """Copia de los datos notificados (vía _leer_json, reparseada solo si cambia el archivo)."""
+    if not mtime_ns:
+        return {"vacantes_notificadas": {}, "log_consultas": []}
+    return _leer_json(str(DATA_FILE), mtime_ns)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _ids_notificadas(mtime_ns: int) -> frozenset[str]:
+    """IDs ya notificados; se recalcula solo cuando cambia el archivo de datos."""
+    return frozenset(_datos_notificadas(mtime_ns)["vacantes_notificadas"])
+
+
+@st.cache_resource(show_spinner=False)
+def _cliente() -> APIClient:
+    """Cliente de la API compartido por todas las sesiones (reutiliza conexiones)."""
+    return APIClient()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _buscar(distrito: str, niveles: tuple[str, ...]) -> list[Vacante]:
+    """Consulta la API; resultados reutilizados 5 minutos para los mismos filtros."""
+    return _cliente().buscar_vacantes(distrito=distrito, niveles=list(niveles) or None)
+
+
+@st.cache_resource(show_spinner=False)
+def _leer_secrets() -> dict:
+    """Lee los secrets de email una sola vez por proceso (no en cada rerun)."""
+    claves = ("EMAIL_FROM", "EMAIL_PASSWORD", "EMAIL_TO")
+    try:
+        return {clave: st.secrets.get(clave, "") for clave in claves}
+    except FileNotFoundError:
+        # Sin secrets.toml (uso local con .env): tab 3 muestra el aviso de configuración
+        return {clave: "" for clave in claves}
+
+
+@st.cache_resource(show_spinner=False)
+def _db_ready() -> bool:
+    """Inicializa el almacenamiento una sola vez por proceso."""
+    inicializar_db()
+    return True
+
 
 def cargar_config_ui():
     """Carga la configuración de la UI."""
     if CONFIG_FILE.exists():
-        return json.loads(CONFIG_FILE.read_text())
+        return _leer_json(str(CONFIG_FILE), _mtime_ns(CONFIG_FILE))
     return {
         "distrito": "patagones",
         "niveles": ["primaria", "secundaria", "artistica"],
@@ -40,23 +121,38 @@ def cargar_config_ui():
 def guardar_config_ui(config_data):
     """Guarda la configuración de la UI."""
     CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CONFIG_FILE.write_text(json.dumps(config_data, indent=2))
+    if orjson is not None:
+        contenido = orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+    else:
+        contenido = json.dumps(config_data, indent=2).encode("utf-8")
+
+    # No reescribir si no hubo cambios
+    if CONFIG_FILE.exists() and CONFIG_FILE.read_bytes() == contenido:
+        return
+
+    # Escribir a un temporal y reemplazar, para no dejar el archivo a medio escribir
+    tmp = CONFIG_FILE.with_suffix(".json.tmp")
+    tmp.write_bytes(contenido)
+    os.replace(tmp, CONFIG_FILE)
+    _leer_json.clear()
 
 
 def cargar_codigos():
     """Carga los códigos del archivo."""
     if CODIGOS_FILE.exists():
-        return CODIGOS_FILE.read_text()
+        return _leer_texto(str(CODIGOS_FILE), _mtime_ns(CODIGOS_FILE))
     return ""
 
 
 def guardar_codigos(texto):
     """Guarda los códigos en el archivo."""
     CODIGOS_FILE.write_text(texto)
+    _leer_texto.clear()
 
 
 # Inicializar
-inicializar_db()
+_db_ready()
+_SECRETS = _leer_secrets()
 
 # === SIDEBAR - Configuración ===
 st.sidebar.title("⚙️ Configuración")
@@ -70,10 +166,11 @@ DISTRITOS = [
     "la plata", "quilmes", "lomas de zamora", "la matanza",
     "general pueyrredon", "tandil", "azul", "olavarria"
 ]
+DISTRITO_IDX = {d: i for i, d in enumerate(DISTRITOS)}
 distrito = st.sidebar.selectbox(
     "📍 Distrito",
     options=DISTRITOS,
-    index=DISTRITOS.index(ui_config.get("distrito", "patagones")) if ui_config.get("distrito") in DISTRITOS else 0
+    index=DISTRITO_IDX.get(ui_config.get("distrito", "patagones"), 0)
 )
 
 # Niveles
@@ -117,8 +214,11 @@ if st.sidebar.button("💾 Guardar códigos"):
     guardar_codigos(codigos_texto)
     st.sidebar.success("Códigos guardados!")
 
-# Mostrar cantidad de códigos
-codigos_set = extraer_codigos_desde_texto(codigos_texto)
+# Mostrar cantidad de códigos (se reparsea solo si el texto cambió)
+if st.session_state.get("_codigos_texto") != codigos_texto:
+    st.session_state["_codigos_set"] = extraer_codigos_desde_texto(codigos_texto)
+    st.session_state["_codigos_texto"] = codigos_texto
+codigos_set = st.session_state["_codigos_set"]
 st.sidebar.caption(f"✓ {len(codigos_set)} códigos cargados")
 
 # === CONTENIDO PRINCIPAL ===
@@ -139,11 +239,7 @@ with tab1:
     if buscar:
         with st.spinner("Consultando API..."):
             try:
-                client = APIClient()
-                vacantes = client.buscar_vacantes(
-                    distrito=distrito,
-                    niveles=niveles if niveles else None
-                )
+                vacantes = _buscar(distrito, tuple(niveles))
 
                 if filtrar_oblea and codigos_set:
                     vacantes = filtrar_por_codigos(vacantes, codigos_set)
@@ -161,27 +257,44 @@ with tab1:
         if vacantes:
             st.success(f"Se encontraron **{len(vacantes)}** vacantes")
 
-            for v in vacantes:
-                with st.expander(f"**{v.cargo}** - {v.nivel_modalidad.upper()}", expanded=False):
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        st.write(f"**Código área:** {v.area_incumbencia}")
-                        st.write(f"**Escuela:** {v.escuela_nombre}")
-                        st.write(f"**Domicilio:** {v.domicilio}")
-                        st.write(f"**Turno:** {v.turno} | **Jornada:** {v.jornada}")
-
-                    with col2:
-                        st.write(f"**Toma posesión:** {v.fecha_inicio or 'No especificado'}")
-                        st.write(f"**Cierre oferta:** {v.fecha_fin_oferta or 'No especificado'}")
-                        if v.docente_reemplazado:
-                            st.write(f"**Reemplaza a:** {v.docente_reemplazado}")
-                            st.write(f"**Motivo:** {v.motivo_reemplazo}")
-
-                    # Horarios
-                    horarios = [f"{dia}: {hora}" for dia, hora in v.horarios.items() if hora]
-                    if horarios:
-                        st.write("**Horarios:**", " | ".join(horarios))
+            # Toda la lista en una sola tabla
+            vacantes_df = pd.DataFrame(
+                [{col: getattr(v, campo) for campo, col in COLUMNAS_VACANTES.items()} for v in vacantes]
+            )
+            st.dataframe(
+                vacantes_df,
+                use_container_width=True,
+                hide_index=True,
+            )
+
+            # Solo se renderiza el detalle de la vacante seleccionada
+            vacantes_por_id = {v.id: v for v in vacantes}
+            open_id = st.selectbox(
+                "Ver detalle",
+                options=list(vacantes_por_id),
+                format_func=lambda vid: f"{vacantes_por_id[vid].cargo} - {vacantes_por_id[vid].nivel_modalidad.upper()}",
+                key="open_id",
+            )
+            v = vacantes_por_id[open_id]
+
+            # Detalle armado como un único bloque markdown
+            lineas = [
+                f"**Código área:** {v.area_incumbencia}",
+                f"**Escuela:** {v.escuela_nombre}",
+                f"**Domicilio:** {v.domicilio}",
+                f"**Turno:** {v.turno} | **Jornada:** {v.jornada}",
+                f"**Toma posesión:** {v.fecha_inicio or 'No especificado'}",
+                f"**Cierre oferta:** {v.fecha_fin_oferta or 'No especificado'}",
+            ]
+            if v.docente_reemplazado:
+                lineas.append(f"**Reemplaza a:** {v.docente_reemplazado}")
+                lineas.append(f"**Motivo:** {v.motivo_reemplazo}")
+
+            if v.horarios_str:
+                lineas.append(f"**Horarios:** {v.horarios_str}")
+
+            with st.container(border=True):
+                st.markdown("  \n".join(lineas))
         else:
             st.info("No se encontraron vacantes con los filtros actuales")
     else:
@@ -191,7 +304,13 @@ with tab1:
 with tab2:
     st.subheader("📊 Estadísticas")
 
-    stats = obtener_estadisticas()
+    # Una sola lectura del archivo para estadísticas y listados
+    datos = _datos_notificadas(_mtime_ns(DATA_FILE))
+    stats = {
+        "total_notificadas": len(datos["vacantes_notificadas"]),
+        "ultima_consulta": datos["log_consultas"][-1] if datos["log_consultas"] else None,
+        "total_consultas": len(datos["log_consultas"]),
+    }
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Total notificadas", stats["total_notificadas"])
@@ -204,14 +323,20 @@ with tab2:
 
     st.subheader("📜 Vacantes Notificadas")
 
-    datos = _cargar_datos()
     if datos["vacantes_notificadas"]:
-        for vid, info in sorted(datos["vacantes_notificadas"].items(),
-                                key=lambda x: x[1]["fecha_notificacion"],
-                                reverse=True):
-            escuela = info.get('escuela', '')
-            escuela_str = f" - {escuela}" if escuela else ""
-            st.write(f"• **{info['cargo']}** ({info['nivel']}){escuela_str} - {info['fecha_notificacion'][:10]}")
+        notificadas_df = pd.DataFrame([
+            {
+                "Cargo": info["cargo"],
+                "Nivel": info["nivel"],
+                "Escuela": info.get("escuela", ""),
+                "Fecha": info["fecha_notificacion"][:10],
+            }
+            # storage las mantiene en orden cronológico: recorrer al revés
+            for info in islice(reversed(datos["vacantes_notificadas"].values()), NOTIFICADAS_MOSTRADAS)
+        ])
+        st.dataframe(notificadas_df, use_container_width=True, hide_index=True)
+        if stats["total_notificadas"] > NOTIFICADAS_MOSTRADAS:
+            st.caption(f"Mostrando las {NOTIFICADAS_MOSTRADAS} más recientes de {stats['total_notificadas']}")
     else:
         st.info("No hay vacantes notificadas aún")
 
@@ -219,9 +344,16 @@ with tab2:
 
     st.subheader("📝 Log de consultas")
     if datos["log_consultas"]:
-        for log in reversed(datos["log_consultas"][-10:]):
-            status = "✅" if log["estado"] == "OK" else "❌"
-            st.write(f"{status} {log['fecha'][:16].replace('T', ' ')} - {log['total_encontradas']} encontradas, {log['nuevas']} nuevas")
+        log_df = pd.DataFrame([
+            {
+                "Estado": "✅" if log["estado"] == "OK" else "❌",
+                "Fecha": log["fecha"][:16].replace("T", " "),
+                "Encontradas": log["total_encontradas"],
+                "Nuevas": log["nuevas"],
+            }
+            for log in reversed(datos["log_consultas"][-10:])
+        ])
+        st.dataframe(log_df, use_container_width=True, hide_index=True)
     else:
         st.info("No hay consultas registradas")
 
@@ -232,8 +364,8 @@ with tab3:
     st.warning("Esta acción enviará un email con las vacantes nuevas encontradas.")
 
     # Verificar configuración
-    email_from = st.secrets.get("EMAIL_FROM", "") if hasattr(st, 'secrets') else ""
-    email_pass = st.secrets.get("EMAIL_PASSWORD", "") if hasattr(st, 'secrets') else ""
+    email_from = _SECRETS["EMAIL_FROM"]
+    email_pass = _SECRETS["EMAIL_PASSWORD"]
 
     if not email_from or not email_pass:
         st.error("⚠️ Credenciales de email no configuradas en Streamlit Secrets")
@@ -245,29 +377,22 @@ with tab3:
 
     if 'vacantes' in st.session_state and st.session_state['vacantes']:
         vacantes = st.session_state['vacantes']
-        nuevas = filtrar_nuevas(vacantes)
+        notificadas = _ids_notificadas(_mtime_ns(DATA_FILE))
+        nuevas = [v for v in vacantes if v.id not in notificadas]
 
         st.write(f"Vacantes totales: **{len(vacantes)}**")
         st.write(f"Vacantes nuevas (no notificadas): **{len(nuevas)}**")
 
-        email_destino = email_to or (st.secrets.get("EMAIL_TO", "") if hasattr(st, 'secrets') else "")
+        email_destino = email_to or _SECRETS["EMAIL_TO"]
 
         if nuevas and email_destino:
             if st.button("📤 Enviar email con vacantes nuevas", type="primary"):
                 with st.spinner("Enviando email..."):
-                    # Temporalmente setear el email destino
-                    import config
-                    original_to = config.EMAIL_TO
-                    config.EMAIL_TO = email_destino
-
-                    if enviar_email(nuevas):
-                        for v in nuevas:
-                            marcar_como_notificada(v.id, v.cargo, v.area_incumbencia, v.nivel_modalidad, v.escuela_nombre)
+                    if enviar_email(nuevas, to=email_destino):
+                        marcar_muchas(nuevas)
                         st.success(f"Email enviado a {email_destino}!")
                     else:
                         st.error("Error al enviar email")
-
-                    config.EMAIL_TO = original_to
         elif not nuevas:
             st.info("No hay vacantes nuevas para notificar")
         elif not email_destino: